@@ -184,16 +184,25 @@ Generate 5-10 SMART suggestions that:
     
     def select_suggestions(self, selected_ids: List[int]):
         """Mark suggestions as selected by user"""
+        selected_ids = set(selected_ids)
+        self.selected_suggestions = []
         for suggestion in self.all_suggestions:
-            if suggestion['id'] in selected_ids:
-                suggestion['selected'] = True
+            suggestion['selected'] = suggestion['id'] in selected_ids
+            if suggestion['selected']:
                 self.selected_suggestions.append(suggestion)
     
     def modify_suggestion(self, suggestion_id: int, new_value: str):
         """Allow user to modify a suggestion's value"""
+        self.modify_suggestions({suggestion_id: new_value})
+    
+    def modify_suggestions(self, edits: Dict[int, str]):
+        """Apply several user edits in one pass over the suggestions"""
+        if not edits:
+            return
+        
         for suggestion in self.all_suggestions:
-            if suggestion['id'] == suggestion_id:
-                suggestion['value'] = new_value
+            if suggestion['id'] in edits:
+                suggestion['value'] = edits[suggestion['id']]
                 suggestion['modified'] = True
     
     def get_selected_suggestions(self) -> List[Dict]:
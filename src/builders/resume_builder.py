@@ -2,9 +2,10 @@
 Professional Resume Builder - FULLY ADAPTIVE
 Handles ANY resume structure dynamically
 """
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import BinaryIO, Dict, Any, Optional, Union
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -70,11 +71,23 @@ def draw_sidebar_background(canvas, doc):
 class CompactStreamlinedBuilder:
     """Fully adaptive resume builder - works with ANY JSON structure"""
     
-    def __init__(self, json_path: str):
-        self.json_path = Path(json_path)
-        self.data = self._load_json()
+    # Styles are never modified after creation, so every builder shares one stylesheet
+    _styles = None
+    
+    def __init__(self, json_path: Optional[str] = None, data: Optional[Dict[str, Any]] = None):
+        if json_path is None and data is None:
+            raise ValueError("Either json_path or data is required")
+        
+        self.json_path = Path(json_path) if json_path else None
+        # Copy in-memory data - _normalize_data fills in missing keys
+        self.data = copy.deepcopy(data) if data is not None else self._load_json()
         self._normalize_data()
-        self.styles = self._create_styles()
+        self.styles = self._get_styles()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactStreamlinedBuilder':
+        """Create a builder from resume data already in memory"""
+        return cls(data=data)
     
     def _load_json(self) -> Dict[str, Any]:
         """Load resume data from JSON"""
@@ -122,7 +135,15 @@ class CompactStreamlinedBuilder:
         if 'certifications' not in self.data:
             self.data['certifications'] = []
     
-    def _create_styles(self):
+    @classmethod
+    def _get_styles(cls):
+        """Shared paragraph styles, created on first use"""
+        if cls._styles is None:
+            cls._styles = cls._create_styles()
+        return cls._styles
+    
+    @staticmethod
+    def _create_styles():
         """Create paragraph styles"""
         styles = getSampleStyleSheet()
         
@@ -195,11 +216,17 @@ class CompactStreamlinedBuilder:
         
         return styles
     
-    def generate_pdf(self, output_path: str) -> str:
-        """Generate adaptive professional resume"""
-        print(f"📄 Generating resume from: {self.json_path}")
+    def generate_pdf(self, output_path: Union[str, Path, BinaryIO]) -> Union[str, BinaryIO]:
+        """
+        Generate adaptive professional resume
+        
+        output_path may be a file path or a writable binary stream (e.g. io.BytesIO)
+        """
+        print(f"📄 Generating resume from: {self.json_path or 'resume data'}")
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(output_path, (str, Path)):
+            output_path = str(output_path)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
         doc = SimpleDocTemplate(
             output_path,
@@ -245,7 +272,7 @@ class CompactStreamlinedBuilder:
         story.append(main_table)
         doc.build(story, onFirstPage=draw_sidebar_background, onLaterPages=draw_sidebar_background)
         
-        print(f"✅ Resume PDF generated: {output_path}")
+        print(f"✅ Resume PDF generated: {output_path if isinstance(output_path, str) else 'in memory'}")
         return output_path
     
     def _build_main(self):
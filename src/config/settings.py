@@ -13,10 +13,16 @@ BASE_DIR = Path(__file__).parent.parent.parent
 DATA_DIR = BASE_DIR / "data"
 OUTPUT_DIR = BASE_DIR / "output"
 SRC_DIR = BASE_DIR / "src"
+# Served by Streamlit at app/static/ (server.enableStaticServing)
+STATIC_DIR = BASE_DIR / "static"
+# Short-lived session snapshots (restored after a browser refresh)
+CACHE_DIR = BASE_DIR / ".cache"
 
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
+STATIC_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # File paths
 RESUME_MASTER_JSON = DATA_DIR / "resume_master.json"
@@ -43,6 +49,8 @@ class Settings:
     BASE_DIR = BASE_DIR
     DATA_DIR = DATA_DIR
     OUTPUT_DIR = OUTPUT_DIR
+    STATIC_DIR = STATIC_DIR
+    CACHE_DIR = CACHE_DIR
     RESUME_MASTER_JSON = RESUME_MASTER_JSON
     JD_FILE = JD_FILE
     
@@ -10,6 +10,11 @@ import pdfplumber
 from openai import OpenAI
 from src.config.settings import settings
 
+try:
+    import fitz  # PyMuPDF - much faster text extraction
+except ImportError:
+    fitz = None
+
 
 class PDFResumeParser:
     """Production-ready parser"""
@@ -18,12 +23,40 @@ class PDFResumeParser:
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = "gpt-4.1-nano"
     
+    def extract_text_with_pymupdf(self, pdf_file) -> tuple:
+        """Extract text and hyperlinks with PyMuPDF"""
+        pdf_file.seek(0)
+        text_parts = []
+        links = []
+        
+        with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
+            for page in doc:
+                page_text = page.get_text("text")
+                if page_text:
+                    text_parts.append(page_text)
+                
+                for link in page.get_links():
+                    if link.get('uri'):
+                        links.append(link['uri'])
+        
+        return "\n".join(text_parts).strip(), links
+    
     def extract_text_and_links_from_pdf(self, pdf_file) -> tuple:
-        """Extract text and hyperlinks"""
+        """Extract text and hyperlinks (PyMuPDF when installed, else pdfplumber/PyPDF2)"""
         text = ""
         links = []
         
         try:
+            if fitz is not None:
+                try:
+                    text, links = self.extract_text_with_pymupdf(pdf_file)
+                except Exception:
+                    # PyMuPDF couldn't read it - let pdfplumber/PyPDF2 try
+                    text, links = "", []
+                if text:
+                    return text, links
+                pdf_file.seek(0)
+            
             with pdfplumber.open(pdf_file) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
@@ -117,12 +150,14 @@ class PDFResumeParser:
         return pii
     
     def sanitize_text(self, text: str, pii: Dict[str, str]) -> str:
-        """Remove PII"""
-        sanitized = text
-        for value in pii.values():
-            if value:
-                sanitized = sanitized.replace(value, "[REDACTED]")
-        return sanitized
+        """Remove PII - one pass over the text for all values"""
+        values = sorted({value for value in pii.values() if value}, key=len, reverse=True)
+        if not values:
+            return text
+        
+        # Longest first so a value that contains another is redacted whole
+        pattern = re.compile('|'.join(map(re.escape, values)))
+        return pattern.sub("[REDACTED]", text)
     
     def parse_sanitized_resume(self, sanitized_text: str) -> Dict[str, Any]:
         """Parse with COMPLETE extraction - FOCUS ON SKILLS"""
@@ -2,18 +2,60 @@
 Enhanced Section extraction for Business Analyst resumes
 """
 import re
-from typing import Dict, Optional, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, List, Tuple
 from src.config.settings import settings
 from src.utils.text_cleaner import TextCleaner
 from src.utils.pattern_matcher import PatternMatcher
 from src.models.resume_data import Experience, Education, Project, Certification
 
+_PATTERN_MATCHER = PatternMatcher()
+
+
+@lru_cache(maxsize=1024)
+def _extract_dates_cached(line: str) -> Tuple[str, ...]:
+    """Memoized PatternMatcher.extract_dates - date lines recur across entries"""
+    return tuple(_PATTERN_MATCHER.extract_dates(line))
+
+
+_MONTH_SET = {'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'}
+
+# "Month Year - Month Year|Present"; the 3-letter month prefixes are validated
+# against _MONTH_SET after matching instead of via a 12-way alternation.
+# Present|Current is tried first so "Present 2021" is never taken as a month
+_DURATION_MONTH_RE = re.compile(
+    r'([a-z]{3})[a-z]*\.?\s+\d{4}\s*[-–—]\s*(?:Present|Current|([a-z]{3})[a-z]*\.?\s+\d{4})',
+    re.IGNORECASE
+)
+_DURATION_YEAR_RE = re.compile(r'(\d{4})\s*[-–—]\s*(\d{4}|Present|Current)', re.IGNORECASE)
+
+# Next-header scan is capped to a plausible section length so each
+# extract_section call is bounded regardless of resume length
+_MAX_SECTION_CHARS = 16384
+_NEXT_HEADER_RE = re.compile(r'\n\s*(?:[A-Z][A-Z\s&/]{2,}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*\n')
+
+# Entries are separated by blank (possibly whitespace-only) lines
+_BLANK_LINE_RE = re.compile(r'\n\s*\n')
+
+
+@lru_cache(maxsize=None)
+def _section_header_re(keywords: Tuple[str, ...], ignore_case: bool = False) -> re.Pattern:
+    """Compile the section-start pattern for a set of (lowercased) header keywords"""
+    section_pattern = '|'.join(re.escape(kw.lower()) for kw in keywords)
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(rf'(?:^|\n)\s*({section_pattern})\s*\n', flags)
+
+
 class SectionExtractor:
     """Extract different sections from resume text"""
     
     def __init__(self, text: str):
         """Initialize section extractor"""
         self.text = text
+        # Header matching runs on a lowercased copy so the patterns need no
+        # IGNORECASE; offsets map back to self.text only if lengths agree
+        self._text_lower = text.lower()
+        self._lower_aligned = len(self._text_lower) == len(text)
         self.text_cleaner = TextCleaner()
         self.pattern_matcher = PatternMatcher()
     
@@ -24,12 +66,11 @@ class SectionExtractor:
             return None
         
         # Find section start
-        section_pattern = '|'.join([re.escape(kw) for kw in keywords])
-        match = re.search(
-            rf'(?:^|\n)\s*({section_pattern})\s*\n',
-            self.text,
-            re.IGNORECASE | re.MULTILINE
-        )
+        if self._lower_aligned:
+            match = _section_header_re(tuple(keywords)).search(self._text_lower)
+        else:
+            # Some non-ASCII characters change length when lowercased
+            match = _section_header_re(tuple(keywords), True).search(self.text)
         
         if not match:
             return None
@@ -38,13 +79,13 @@ class SectionExtractor:
         
         # Find next section (end of current section)
         # Look for next all-caps or title-case header
-        next_section = re.search(
-            r'\n\s*(?:[A-Z][A-Z\s&/]{2,}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*\n',
-            self.text[start_pos:]
-        )
+        next_section = _NEXT_HEADER_RE.search(self.text, start_pos, start_pos + _MAX_SECTION_CHARS)
+        if not next_section and len(self.text) > start_pos + _MAX_SECTION_CHARS:
+            # Unusually long section - keep looking past the window
+            next_section = _NEXT_HEADER_RE.search(self.text, start_pos)
         
         if next_section:
-            end_pos = start_pos + next_section.start()
+            end_pos = next_section.start()
         else:
             end_pos = len(self.text)
         
@@ -81,19 +122,18 @@ class SectionExtractor:
         entries = self._split_experience_entries(text)
         
         for entry in entries:
-            if not entry.strip():
-                continue
-            
-            lines = [l.strip() for l in entry.split('\n') if l.strip()]
+            lines = [s for l in entry if (s := l.strip())]
             if len(lines) < 2:
                 continue
             
             # First line: Job Title | Company
             first_line = lines[0]
+            has_pipe = '|' in first_line
+            bullets_start = 2 if has_pipe else 3
             title = ""
             company = ""
             
-            if '|' in first_line:
+            if has_pipe:
                 parts = first_line.split('|')
                 title = parts[0].strip()
                 company = parts[1].strip()
@@ -102,7 +142,7 @@ class SectionExtractor:
                 company = lines[1] if len(lines) > 1 else ""
             
             # Second line: Date range
-            date_line = lines[1] if '|' in first_line else (lines[2] if len(lines) > 2 else "")
+            date_line = lines[1] if has_pipe else (lines[2] if len(lines) > 2 else "")
             duration = self._extract_duration_from_line(date_line)
             
             # Extract start and end dates
@@ -110,11 +150,11 @@ class SectionExtractor:
             
             # Rest are bullet points (achievements)
             achievements = []
-            for line in lines[2:] if '|' in first_line else lines[3:]:
+            for line in lines[bullets_start:]:
                 # Check if it's a bullet point or sub-section
                 if line.startswith('•') or line.startswith('-') or line.startswith('*'):
                     # Remove bullet and add
-                    achievement = re.sub(r'^[•\-\*]\s*', '', line)
+                    achievement = line[1:].lstrip()
                     achievements.append(achievement)
                 elif ':' in line and len(line) < 100:
                     # This might be a category like "Requirements Engineering:"
@@ -138,12 +178,11 @@ class SectionExtractor:
         
         return experiences
     
-    def _split_experience_entries(self, text: str) -> List[str]:
-        """Split experience text into individual job entries"""
+    def _split_experience_entries(self, text: str) -> Iterator[List[str]]:
+        """Split experience text into individual job entries (as raw lines)"""
         # Look for patterns that indicate a new job entry
         # Usually: Job title followed by company (with |) and date range
         
-        entries = []
         current_entry = []
         lines = text.split('\n')
         
@@ -160,28 +199,30 @@ class SectionExtractor:
             
             if is_new_entry and current_entry:
                 # Start new entry
-                entries.append('\n'.join(current_entry))
+                yield current_entry
                 current_entry = [line]
             else:
                 current_entry.append(line)
         
         # Add last entry
         if current_entry:
-            entries.append('\n'.join(current_entry))
-        
-        return entries
+            yield current_entry
     
     def _extract_duration_from_line(self, line: str) -> Optional[str]:
         """Extract duration from a line"""
         # Pattern: Month Year - Month Year or Present
-        pattern = r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})\s*[-–—]\s*((?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4})|Present|Current)'
-        match = re.search(pattern, line, re.IGNORECASE)
-        if match:
-            return match.group(0)
+        pos = 0
+        while (match := _DURATION_MONTH_RE.search(line, pos)):
+            start_month, end_month = match.group(1), match.group(2)
+            if start_month.casefold() in _MONTH_SET and (
+                end_month is None or end_month.casefold() in _MONTH_SET
+            ):
+                return match.group(0)
+            # Not a month name - retry from the next position
+            pos = match.start() + 1
         
         # Pattern: Just years
-        pattern = r'(\d{4})\s*[-–—]\s*(\d{4}|Present|Current)'
-        match = re.search(pattern, line, re.IGNORECASE)
+        match = _DURATION_YEAR_RE.search(line)
         if match:
             return match.group(0)
         
@@ -210,13 +251,13 @@ class SectionExtractor:
             return []
         
         education_list = []
-        entries = re.split(r'\n\s*\n', text)
+        entries = _BLANK_LINE_RE.split(text)
         
         for entry in entries:
             if not entry.strip():
                 continue
             
-            lines = [l.strip() for l in entry.split('\n') if l.strip()]
+            lines = [s for l in entry.split('\n') if (s := l.strip())]
             if not lines:
                 continue
             
@@ -238,7 +279,7 @@ class SectionExtractor:
                         gpa = degree_parts[1].strip()
                 elif re.search(r'\d{4}', line):
                     # This line has dates
-                    dates = self.pattern_matcher.extract_dates(line)
+                    dates = _extract_dates_cached(line)
                     graduation_date = dates[-1] if dates else None
                 elif not institution and not any(kw in line.upper() for kw in ['CERTIFICATE', 'DIPLOMA', 'DEGREE', 'B.TECH', 'M.TECH', 'PGDM', 'MBA']):
                     # This is likely the institution
@@ -272,13 +313,13 @@ class SectionExtractor:
         certifications = []
         
         # Split by double newlines or certification patterns
-        entries = re.split(r'\n\s*\n', text)
+        entries = _BLANK_LINE_RE.split(text)
         
         for entry in entries:
             if not entry.strip():
                 continue
             
-            lines = [l.strip() for l in entry.split('\n') if l.strip()]
+            lines = [s for l in entry.split('\n') if (s := l.strip())]
             if not lines:
                 continue
             
@@ -293,7 +334,7 @@ class SectionExtractor:
             for line in lines[1:]:
                 # Extract year
                 if re.search(r'\d{4}', line) and not date:
-                    dates = self.pattern_matcher.extract_dates(line)
+                    dates = _extract_dates_cached(line)
                     date = dates[0] if dates else None
                 
                 # Extract certificate/candidate number
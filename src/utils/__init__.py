@@ -2,5 +2,6 @@
 Utility Functions Package
 """
 from .resume_merger import ResumeMerger
+from .json_io import dumps_json, loads_json, save_json
 
-__all__ = ['ResumeMerger']
+__all__ = ['ResumeMerger', 'dumps_json', 'loads_json', 'save_json']
@@ -0,0 +1,33 @@
+"""
+JSON helpers - orjson when installed, stdlib json otherwise
+"""
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to stdlib json
+    orjson = None
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def save_json(data: Any, filepath: Union[str, Path]):
+    """Write data to a file as indented UTF-8 JSON"""
+    with open(filepath, 'wb') as f:
+        f.write(dumps_json(data, indent=True))
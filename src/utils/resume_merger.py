@@ -1,10 +1,11 @@
 """
 Resume Merger - Merges sanitized changes back with PII
 """
-import json
 import copy
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 from pathlib import Path
+from .json_io import save_json
 
 class ResumeMerger:
     """Merge sanitized resume changes back with original PII"""
@@ -65,16 +66,22 @@ class ResumeMerger:
         resume: Dict[str, Any],
         company_name: str,
         match_score_before: int,
-        changes_count: int
+        changes_count: int,
+        created_at: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Add metadata to track tailoring"""
-        from datetime import datetime
+        """
+        Add metadata to track tailoring
+        
+        Pass created_at to reuse one timestamp when tailoring for several
+        companies in a batch; defaults to the current UTC time.
+        """
+        created_at = created_at or datetime.now(timezone.utc).isoformat()
         
         resume_with_meta = copy.deepcopy(resume)
         resume_with_meta['_metadata'] = {
             'source': 'resume_master.json',
             'tailored_for': company_name,
-            'created_at': datetime.now().isoformat(),
+            'created_at': created_at,
             'match_score_before': match_score_before,
             'changes_applied': changes_count
         }
@@ -84,7 +91,6 @@ class ResumeMerger:
     @staticmethod
     def save_resume(resume: Dict[str, Any], filepath: Path):
         """Save resume to JSON file"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(resume, f, indent=2, ensure_ascii=False)
+        save_json(resume, filepath)
         
         print(f"✅ Saved: {filepath}")
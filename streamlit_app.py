@@ -3,17 +3,18 @@ Resume Optimizer - Complete Production Version with PDF Upload
 Features: PDF parsing, AI suggestions, drag-and-drop, live preview, detailed analysis
 """
 import streamlit as st
-from streamlit_sortables import sort_items
-import json
 from pathlib import Path
 from datetime import datetime
-import base64
+import copy
+import hashlib
+import io
+import secrets
+import threading
+import time
+from collections import defaultdict
 
 from src.config.settings import settings
-from src.analyzers import PIISanitizer, JDAnalyzer, ResumeMatcher
-from src.agents import ResumeOptimizerAgent
-from src.utils import ResumeMerger
-from src.builders.resume_builder import ResumeBuilder
+from src.utils import ResumeMerger, dumps_json, loads_json, save_json
 
 
 # Page config
@@ -24,6 +25,26 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+def _warmup():
+    """Import the PDF parsing and AI stacks before the user first needs them"""
+    import src.parsers.pdf_to_json  # noqa: F401
+    import src.analyzers  # noqa: F401
+    import src.agents  # noqa: F401
+    import src.builders.resume_builder  # noqa: F401
+    import pandas  # noqa: F401
+
+
+@st.cache_resource(show_spinner=False)
+def _start_warmup():
+    thread = threading.Thread(target=_warmup, daemon=True)
+    thread.start()
+    return thread
+
+
+# Once per process - the page renders while heavy modules import in the background
+_start_warmup()
+
 # Mobile-optimized CSS
 st.markdown("""
 <style>
@@ -48,7 +69,8 @@ if 'step' not in st.session_state:
     st.session_state.step = 1
     st.session_state.jd_text = ""
     st.session_state.suggestions = []
-    st.session_state.selected_ids = []
+    st.session_state.suggestions_by_id = {}
+    st.session_state.selected_ids = set()
     st.session_state.edited_suggestions = {}
     st.session_state.agent = None
     st.session_state.match_analysis = None
@@ -56,11 +78,97 @@ if 'step' not in st.session_state:
     st.session_state.sanitized_resume = None
     st.session_state.jd_requirements = None
     st.session_state.preview_resume = None
+    st.session_state.preview_base = None
+    st.session_state.preview_signature = None
+    st.session_state.preview_version = 0
+    st.session_state.achievement_bases = {}
+    st.session_state.pdf_url = None
+    st.session_state.pdf_dirty = True
+    st.session_state.preview_token = secrets.token_hex(8)
+    st.session_state.session_token = secrets.token_hex(8)
+    st.session_state.analyzed_jd_text = None
+    st.session_state.restored_session = False
+
+
+PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+SNAPSHOT_TTL_SECONDS = 3600
+PREVIEW_TTL_SECONDS = 3600
+
+
+def _prune_expired(directory, pattern, ttl_seconds):
+    """Delete files matching pattern that haven't been written for ttl_seconds"""
+    now = time.time()
+    for old in directory.glob(pattern):
+        try:
+            if now - old.stat().st_mtime > ttl_seconds:
+                old.unlink(missing_ok=True)
+        except OSError:
+            # Another session removed it first
+            pass
+
+
+def _snapshot_path(token):
+    return settings.CACHE_DIR / f"session_{token}.json"
+
+
+def save_snapshot():
+    """
+    Persist the parsed resume and analyzed JD under the session token in the URL
+    
+    Best effort - a failed write only means a refresh can't restore the session.
+    """
+    token = st.session_state.session_token
+    try:
+        _prune_expired(settings.CACHE_DIR, "session_*.json", SNAPSHOT_TTL_SECONDS)
+        save_json({
+            "original_resume": st.session_state.original_resume,
+            "jd_text": st.session_state.analyzed_jd_text,
+            "jd_requirements": st.session_state.jd_requirements
+        }, _snapshot_path(token))
+    except Exception:
+        return
+    
+    st.query_params["s"] = token
+
+
+def load_snapshot(token):
+    """Snapshot saved by save_snapshot(), or None if missing/expired"""
+    if not token.isalnum():
+        return None
+    
+    _prune_expired(settings.CACHE_DIR, "session_*.json", SNAPSHOT_TTL_SECONDS)
+    path = _snapshot_path(token)
+    try:
+        if time.time() - path.stat().st_mtime > SNAPSHOT_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+        return loads_json(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+# A refreshed tab starts a new session - hydrate it from the snapshot in ?s=
+if st.session_state.original_resume is None and not st.session_state.restored_session:
+    snapshot = load_snapshot(st.query_params.get("s", ""))
+    if snapshot:
+        st.session_state.session_token = st.query_params["s"]
+        st.session_state.original_resume = snapshot["original_resume"]
+        st.session_state.jd_text = st.session_state.jd_input = snapshot["jd_text"] or ""
+        st.session_state.analyzed_jd_text = snapshot["jd_text"]
+        st.session_state.jd_requirements = snapshot["jd_requirements"]
+        st.session_state.restored_session = True
 
 
 def reset_app():
+    # The preview and snapshot hold the resume's contact details - don't leave them behind
+    if 'preview_token' in st.session_state:
+        (settings.STATIC_DIR / f"preview_{st.session_state.preview_token}.pdf").unlink(missing_ok=True)
+    if 'session_token' in st.session_state:
+        _snapshot_path(st.session_state.session_token).unlink(missing_ok=True)
+    
     for key in list(st.session_state.keys()):
         del st.session_state[key]
+    st.query_params.clear()
     st.rerun()
 
 
@@ -70,23 +178,211 @@ def safe_str(value):
     return str(value)
 
 
+@st.cache_resource
+def get_sanitizer():
+    from src.analyzers import PIISanitizer
+    return PIISanitizer()
+
+
+@st.cache_resource
+def get_jd_analyzer():
+    from src.analyzers import JDAnalyzer
+    return JDAnalyzer()
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _analyze_jd_cached(jd_text):
+    """JD requirements keyed on the JD text - re-analyzing an unchanged JD is free"""
+    return get_jd_analyzer().analyze_jd(jd_text)
+
+
+@st.cache_resource
+def get_matcher():
+    from src.analyzers import ResumeMatcher
+    return ResumeMatcher()
+
+
+@st.cache_data(show_spinner=False)
+def _calculate_match_cached(sanitized_json, jd_json):
+    """Match analysis keyed on the serialized resume and JD requirements"""
+    return get_matcher().calculate_match(loads_json(sanitized_json), loads_json(jd_json))
+
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_parser():
+    from src.parsers.pdf_to_json import PDFResumeParser
+    return PDFResumeParser()
+
+
+@st.cache_data(show_spinner="🤖 Parsing resume... (10-15 seconds)", max_entries=16)
+def _parse_pdf_cached(pdf_bytes):
+    """Parse an uploaded resume PDF - keyed on the file bytes"""
+    return get_pdf_parser().parse_pdf_resume(io.BytesIO(pdf_bytes))
+
+
+@st.cache_data(show_spinner=False)
+def load_master(path_str, mtime):
+    """Load the master resume JSON - mtime is part of the key so edits reload"""
+    return loads_json(Path(path_str).read_bytes())
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_pdf_bytes(resume_json):
+    """Render serialized resume JSON to PDF bytes - cached on the JSON"""
+    from src.builders.resume_builder import ResumeBuilder
+    
+    buffer = io.BytesIO()
+    ResumeBuilder.from_dict(loads_json(resume_json)).generate_pdf(buffer)
+    return buffer.getvalue()
+
+
+def render_pdf(resume_data):
+    """
+    Return (fingerprint, pdf_bytes) for resume_data
+    
+    The last render is kept in session state, so an unchanged resume is never
+    rendered twice even if the st.cache_data entry has been evicted.
+    """
+    # Key order is kept (no sort_keys) - skill categories render in dict order
+    resume_json = dumps_json(resume_data)
+    pdf_hash = hashlib.blake2b(resume_json, digest_size=16).hexdigest()
+    
+    if st.session_state.get('last_pdf_hash') != pdf_hash:
+        st.session_state.last_pdf_bytes = _render_pdf_bytes(resume_json)
+        st.session_state.last_pdf_hash = pdf_hash
+    
+    return pdf_hash, st.session_state.last_pdf_bytes
+
+
 def generate_pdf_preview(resume_data):
     try:
-        temp_json = settings.OUTPUT_DIR / "preview_temp.json"
-        with open(temp_json, 'w', encoding='utf-8') as f:
-            json.dump(resume_data, f, indent=2, ensure_ascii=False)
+        pdf_hash, pdf_bytes = render_pdf(resume_data)
         
-        temp_pdf = settings.OUTPUT_DIR / "preview_temp.pdf"
-        builder = ResumeBuilder(str(temp_json))
-        builder.generate_pdf(str(temp_pdf))
+        # One file per session, overwritten in place - ?v= busts the browser cache
+        preview_pdf = settings.STATIC_DIR / f"preview_{st.session_state.preview_token}.pdf"
+        if st.session_state.get('preview_file_hash') != pdf_hash or not preview_pdf.exists():
+            _prune_expired(settings.STATIC_DIR, "preview_*.pdf", PREVIEW_TTL_SECONDS)
+            _prune_expired(settings.CACHE_DIR, "session_*.json", SNAPSHOT_TTL_SECONDS)
+            preview_pdf.write_bytes(pdf_bytes)
+            st.session_state.preview_file_hash = pdf_hash
         
-        with open(temp_pdf, 'rb') as f:
-            return base64.b64encode(f.read()).decode('utf-8')
+        # Browser fetches (and caches) the file instead of a base64 data URI
+        return f"app/static/{preview_pdf.name}?v={pdf_hash}"
     except Exception as e:
         st.error(f"Preview error: {e}")
         return None
 
 
+def _mark_preview_dirty():
+    """on_change callback - the next preview render picks up the edit"""
+    st.session_state.pdf_dirty = True
+
+
+@st.fragment
+def edit_panel():
+    """Step 4 editor - edits update preview_resume without re-rendering the PDF"""
+    import pandas as pd
+    
+    st.subheader("📝 Edit")
+    
+    # Profile
+    profile = st.session_state.preview_resume.get('profile', '')
+    if profile:
+        with st.expander("📄 Summary", expanded=True):
+            new_profile = st.text_area("Profile", value=profile, height=150, key="live_profile", label_visibility="collapsed",
+                                       on_change=_mark_preview_dirty)
+            st.session_state.preview_resume['profile'] = new_profile
+    
+    # Skills
+    skills_dict = st.session_state.preview_resume.get('skills', {})
+    if skills_dict:
+        with st.expander("🛠️ Skills", expanded=True):
+            for category_name, skills_list in skills_dict.items():
+                display_name = category_name.replace('_', ' ').title()
+                skills_str = ', '.join(skills_list) if isinstance(skills_list, list) else str(skills_list)
+                
+                edited_skills = st.text_area(
+                    display_name,
+                    value=skills_str,
+                    height=80,
+                    key=f"live_skills_{category_name}",
+                    label_visibility="visible",
+                    on_change=_mark_preview_dirty
+                )
+                
+                st.session_state.preview_resume['skills'][category_name] = [
+                    s.strip() for s in edited_skills.split(',') if s.strip()
+                ]
+    
+    # Experience
+    experiences = st.session_state.preview_resume.get('experience', [])
+    if experiences:
+        with st.expander("💼 Experience", expanded=True):
+            for exp_idx, exp in enumerate(experiences):
+                title = exp.get('title', 'Position')
+                company = exp.get('company', 'Company')
+                
+                st.markdown(f"**{title}** at {company}")
+                
+                # One data editor per job instead of a text area + delete button per
+                # bullet. The editor must get the same input on every rerun, so it is
+                # built from a snapshot and edits are applied to the snapshot here.
+                base_key = f"{st.session_state.preview_version}_{exp_idx}"
+                base = st.session_state.achievement_bases.setdefault(base_key, list(exp.get('achievements', [])))
+                
+                base_df = pd.DataFrame(
+                    [{'description': a.get('description', '') if isinstance(a, dict) else str(a)} for a in base],
+                    columns=['description']
+                )
+                edited_df = st.data_editor(
+                    base_df,
+                    num_rows="dynamic",
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={'description': st.column_config.TextColumn("Achievements", width="large")},
+                    key=f"ach_{base_key}",
+                    on_change=_mark_preview_dirty
+                )
+                
+                achievements = []
+                for row_idx, desc in edited_df['description'].items():
+                    desc = desc if isinstance(desc, str) else ''
+                    if row_idx < len(base):
+                        orig = base[row_idx]
+                        achievements.append({**orig, 'description': desc} if isinstance(orig, dict) else desc)
+                    elif desc.strip():
+                        # Added row
+                        achievements.append({"category": "", "description": desc})
+                exp['achievements'] = achievements
+                
+                if exp_idx < len(experiences) - 1:
+                    st.markdown("---")
+
+
+@st.fragment
+def preview_panel():
+    """Step 4 PDF preview - only re-rendered when flagged dirty (edit or 🔄 Refresh)"""
+    st.subheader("👁️ Preview")
+    
+    # Re-render too if an idle session's file was pruned by another session
+    preview_pdf = settings.STATIC_DIR / f"preview_{st.session_state.preview_token}.pdf"
+    if st.session_state.pdf_dirty or not preview_pdf.exists():
+        with st.spinner("Rendering..."):
+            st.session_state.pdf_url = generate_pdf_preview(st.session_state.preview_resume)
+        st.session_state.pdf_dirty = False
+    
+    pdf_url = st.session_state.pdf_url
+    if pdf_url:
+        st.markdown(f'<iframe src="{pdf_url}" width="100%" height="900px" style="border:1px solid #ddd;"></iframe>', unsafe_allow_html=True)
+    else:
+        st.error("❌ Failed to generate PDF preview")
+    
+    st.caption("Edits show up in the preview after 🔄 Refresh")
+    if st.button("🔄 Refresh", use_container_width=True):
+        st.session_state.pdf_dirty = True
+        st.rerun(scope="fragment")
+
+
 # SIDEBAR
 with st.sidebar:
     st.title("📄 Resume Optimizer")
@@ -95,14 +391,16 @@ with st.sidebar:
     steps = ["Setup", "Analysis", "Select", "Edit", "Preview", "Download"]
     current_step = st.session_state.get('step', 1)
     
-    st.write("**Progress:**")
+    # One markdown element instead of one st.write per step
+    progress_lines = []
     for i, step_name in enumerate(steps, 1):
         if i < current_step:
-            st.write(f"✅ {step_name}")
+            progress_lines.append(f"✅ {step_name}")
         elif i == current_step:
-            st.write(f"🔵 **{step_name}**")
+            progress_lines.append(f"🔵 **{step_name}**")
         else:
-            st.write(f"⚪ {step_name}")
+            progress_lines.append(f"⚪ {step_name}")
+    st.markdown("**Progress:**\n\n" + "\n\n".join(progress_lines))
     
     st.markdown("---")
     
@@ -114,6 +412,10 @@ with st.sidebar:
     if st.button("🔄 Start Over"):
         reset_app()
 
+# Widget state of steps not rendered on the last run has been dropped by Streamlit
+entered_step = st.session_state.get('last_rendered_step') != st.session_state.step
+st.session_state.last_rendered_step = st.session_state.step
+
 # STEP 1 - FIXED with caching
 if st.session_state.step == 1:
     st.title("🚀 Resume Optimizer")
@@ -132,70 +434,32 @@ if st.session_state.step == 1:
             key="pdf_uploader"
         )
         
-        # ✅ CACHE LOGIC - Only parse if NOT already parsed
-        if uploaded_pdf and 'uploaded_file_name' not in st.session_state:
-            # First time upload
-            st.session_state.uploaded_file_name = uploaded_pdf.name
+        # Parse results are cached on the file bytes - reruns and re-uploads of
+        # the same file return immediately
+        if uploaded_pdf:
+            try:
+                resume_data = _parse_pdf_cached(uploaded_pdf.getvalue())
+            except Exception as e:
+                st.error(f"❌ Failed to parse: {str(e)}")
+                st.info("💡 Try a clearer PDF")
+                st.stop()
             
-            with st.spinner("🤖 Parsing resume... (10-15 seconds)"):
-                try:
-                    from src.parsers.pdf_to_json import PDFResumeParser
-                    
-                    parser = PDFResumeParser()
-                    resume_data = parser.parse_pdf_resume(uploaded_pdf)
-                    
-                    st.success(f"✅ Parsed: {resume_data['personal_info']['name']}")
-                    st.session_state.original_resume = resume_data
-                    
-                    st.info("🔒 Your name, email, and phone were extracted **locally** (no AI)")
-                    
-                    with st.expander("👀 Preview extracted data"):
-                        st.json(resume_data)
-                
-                except Exception as e:
-                    st.error(f"❌ Failed to parse: {str(e)}")
-                    st.info("💡 Try a clearer PDF")
-                    # Clear cache on error
-                    if 'uploaded_file_name' in st.session_state:
-                        del st.session_state.uploaded_file_name
-                    st.stop()
-        
-        elif uploaded_pdf and st.session_state.uploaded_file_name == uploaded_pdf.name:
-            # Already parsed - just show cached result
-            if st.session_state.original_resume:
-                st.success(f"✅ Using cached: {st.session_state.original_resume['personal_info']['name']}")
-                
-                with st.expander("👀 View parsed data"):
-                    st.json(st.session_state.original_resume)
-        
-        elif uploaded_pdf and st.session_state.uploaded_file_name != uploaded_pdf.name:
-            # Different file uploaded - reparse
-            st.session_state.uploaded_file_name = uploaded_pdf.name
+            st.success(f"✅ Parsed: {resume_data['personal_info']['name']}")
+            st.session_state.original_resume = resume_data
             
-            with st.spinner("🤖 Parsing new resume... (10-15 seconds)"):
-                try:
-                    from src.parsers.pdf_to_json import PDFResumeParser
-                    
-                    parser = PDFResumeParser()
-                    resume_data = parser.parse_pdf_resume(uploaded_pdf)
-                    
-                    st.success(f"✅ Parsed: {resume_data['personal_info']['name']}")
-                    st.session_state.original_resume = resume_data
-                    
-                    st.info("🔒 Your name, email, and phone were extracted **locally** (no AI)")
-                    
-                    with st.expander("👀 Preview extracted data"):
-                        st.json(resume_data)
-                
-                except Exception as e:
-                    st.error(f"❌ Failed to parse: {str(e)}")
-                    st.info("💡 Try a clearer PDF")
-                    st.stop()
+            st.info("🔒 Your name, email, and phone were extracted **locally** (no AI)")
+            
+            # Only serialized to the frontend when asked for (a collapsed expander still sends it)
+            if st.toggle("👀 Show extracted data", key="show_extracted"):
+                st.json(resume_data, expanded=False)
+        
+        elif st.session_state.restored_session and st.session_state.original_resume:
+            st.info(f"♻️ Restored: {st.session_state.original_resume['personal_info']['name']}")
         
         elif settings.RESUME_MASTER_JSON.exists():
             # Fallback for local dev
-            with open(settings.RESUME_MASTER_JSON, 'r', encoding='utf-8') as f:
-                resume_data = json.load(f)
+            master_path = settings.RESUME_MASTER_JSON
+            resume_data = load_master(str(master_path), master_path.stat().st_mtime)
             st.info(f"👤 Using saved: {resume_data['personal_info']['name']}")
             st.session_state.original_resume = resume_data
         
@@ -218,15 +482,22 @@ if st.session_state.step == 1:
         else:
             with st.spinner("🤖 Analyzing (20-30s)..."):
                 try:
-                    sanitizer = PIISanitizer()
+                    from src.agents import ResumeOptimizerAgent
+                    
+                    sanitizer = get_sanitizer()
                     st.session_state.sanitized_resume = sanitizer.sanitize_resume(st.session_state.original_resume)
                     
-                    jd_analyzer = JDAnalyzer()
-                    jd_requirements = jd_analyzer.analyze_jd(jd_text)
+                    if jd_text == st.session_state.analyzed_jd_text and st.session_state.jd_requirements:
+                        jd_requirements = st.session_state.jd_requirements
+                    else:
+                        jd_requirements = _analyze_jd_cached(jd_text)
                     st.session_state.jd_requirements = jd_requirements
+                    st.session_state.analyzed_jd_text = jd_text
                     
-                    matcher = ResumeMatcher()
-                    match_analysis = matcher.calculate_match(st.session_state.sanitized_resume, jd_requirements)
+                    match_analysis = _calculate_match_cached(
+                        dumps_json(st.session_state.sanitized_resume),
+                        dumps_json(jd_requirements)
+                    )
                     st.session_state.match_analysis = match_analysis
                     
                     agent = ResumeOptimizerAgent()
@@ -236,6 +507,8 @@ if st.session_state.step == 1:
                     
                     st.session_state.agent = agent
                     st.session_state.suggestions = suggestions
+                    st.session_state.suggestions_by_id = {s['id']: s for s in suggestions}
+                    save_snapshot()
                     st.session_state.step = 2
                     st.rerun()
                 except Exception as e:
@@ -256,29 +529,24 @@ elif st.session_state.step == 2:
     st.markdown("---")
     st.subheader("✅ Select Suggestions")
     
-    categories = {}
+    categories = defaultdict(list)
     for sug in st.session_state.suggestions:
-        cat = sug['category']
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(sug)
+        categories[sug['category']].append(sug)
     
     for category, suggestions in categories.items():
         with st.expander(f"📁 {category} ({len(suggestions)})", expanded=True):
             for sug in suggestions:
-                priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}
-                
                 selected = st.checkbox(
-                    f"{priority_emoji[sug['priority']]} {sug['description'][:80]}",
+                    f"{PRIORITY_EMOJI[sug['priority']]} {sug['description'][:80]}",
                     key=f"select_{sug['id']}",
                     value=sug['id'] in st.session_state.selected_ids,
                     help=f"💡 {sug['reason']}"
                 )
                 
-                if selected and sug['id'] not in st.session_state.selected_ids:
-                    st.session_state.selected_ids.append(sug['id'])
-                elif not selected and sug['id'] in st.session_state.selected_ids:
-                    st.session_state.selected_ids.remove(sug['id'])
+                if selected:
+                    st.session_state.selected_ids.add(sug['id'])
+                else:
+                    st.session_state.selected_ids.discard(sug['id'])
                 
                 value = safe_str(sug['value'])
                 if len(value) > 100:
@@ -289,15 +557,15 @@ elif st.session_state.step == 2:
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("✅ All"):
-            st.session_state.selected_ids = [s['id'] for s in st.session_state.suggestions]
+            st.session_state.selected_ids = {s['id'] for s in st.session_state.suggestions}
             st.rerun()
     with col2:
         if st.button("🔴 High"):
-            st.session_state.selected_ids = [s['id'] for s in st.session_state.suggestions if s['priority'] == 'high']
+            st.session_state.selected_ids = {s['id'] for s in st.session_state.suggestions if s['priority'] == 'high'}
             st.rerun()
     with col3:
         if st.button("❌ Clear"):
-            st.session_state.selected_ids = []
+            st.session_state.selected_ids = set()
             st.rerun()
     
     st.markdown("---")
@@ -313,20 +581,34 @@ elif st.session_state.step == 2:
 
 # STEP 3 - Edit Suggestions
 elif st.session_state.step == 3:
+    from streamlit_sortables import sort_items
+    
     st.title("✏️ Edit Suggestions")
     
-    selected_suggestions = [s for s in st.session_state.suggestions if s['id'] in st.session_state.selected_ids]
+    # Order and labels only rebuilt when the selection changes - the user's manual
+    # order survives reruns and Back/Continue
+    selection = frozenset(st.session_state.selected_ids)
+    if st.session_state.get('reorder_selection') != selection:
+        st.session_state.reorder_ids = [s['id'] for s in st.session_state.suggestions if s['id'] in selection]
+        st.session_state.reorder_text_to_id = {
+            f"{s['id']}. [{s['category']}] {s['description']}": s['id']
+            for s in st.session_state.suggestions if s['id'] in selection
+        }
+        st.session_state.reorder_selection = selection
+    
+    text_to_id = st.session_state.reorder_text_to_id
+    id_to_text = {sug_id: text for text, sug_id in text_to_id.items()}
     
     st.subheader("🔄 Reorder")
-    suggestion_texts = [f"{s['id']}. [{s['category']}] {s['description']}" for s in selected_suggestions]
-    ordered_texts = sort_items(suggestion_texts, direction='vertical', key='reorder')
-    ordered_ids = [int(text.split('.')[0]) for text in ordered_texts]
+    ordered_texts = sort_items([id_to_text[sug_id] for sug_id in st.session_state.reorder_ids], direction='vertical', key='reorder')
+    ordered_ids = [text_to_id[text] for text in ordered_texts]
+    st.session_state.reorder_ids = ordered_ids
     
     st.markdown("---")
     st.subheader("📝 Edit Content")
     
     for sug_id in ordered_ids:
-        sug = next(s for s in selected_suggestions if s['id'] == sug_id)
+        sug = st.session_state.suggestions_by_id[sug_id]
         
         with st.expander(f"✏️ [{sug['category']}] {sug['description'][:50]}...", expanded=False):
             original = safe_str(sug['value'])
@@ -354,22 +636,41 @@ elif st.session_state.step == 3:
 elif st.session_state.step == 4:
     st.title("👁️ Live Preview")
     
-    # Generate preview if not exists
-    if st.session_state.preview_resume is None:
+    # The agent + merge result is kept untouched in preview_base and only recomputed
+    # when the selection or suggestion edits change - Back/Reset just copy it again
+    signature = (
+        frozenset(st.session_state.selected_ids),
+        frozenset(st.session_state.edited_suggestions.items())
+    )
+    if st.session_state.preview_base is None or st.session_state.preview_signature != signature:
         with st.spinner("Preparing..."):
             try:
-                for sug_id, edited_value in st.session_state.edited_suggestions.items():
-                    st.session_state.agent.modify_suggestion(sug_id, edited_value)
+                st.session_state.agent.modify_suggestions(st.session_state.edited_suggestions)
                 
                 st.session_state.agent.select_suggestions(st.session_state.selected_ids)
                 updated_sanitized = st.session_state.agent.generate_updated_resume()
                 
                 merger = ResumeMerger()
-                st.session_state.preview_resume = merger.merge(st.session_state.original_resume, updated_sanitized)
+                st.session_state.preview_base = merger.merge(st.session_state.original_resume, updated_sanitized)
+                st.session_state.preview_signature = signature
+                st.session_state.preview_resume = None
             except Exception as e:
                 st.error(f"❌ Failed to generate preview: {str(e)}")
+                st.session_state.preview_base = None
                 st.session_state.preview_resume = None
     
+    # Fresh working copy for the editor
+    if st.session_state.preview_resume is None and st.session_state.preview_base is not None:
+        st.session_state.preview_resume = copy.deepcopy(st.session_state.preview_base)
+        st.session_state.preview_version += 1
+        st.session_state.achievement_bases = {}
+        st.session_state.pdf_dirty = True
+    elif entered_step and st.session_state.preview_resume is not None:
+        # Back from step 3/5 - the achievement editors lost their state, so
+        # rebuild their snapshots from the (edited) working copy
+        st.session_state.preview_version += 1
+        st.session_state.achievement_bases = {}
+    
     # ✅ CRITICAL: Null check IMMEDIATELY after generation
     if st.session_state.preview_resume is None:
         st.error("❌ Failed to generate preview. Please go back and try again.")
@@ -387,97 +688,10 @@ elif st.session_state.step == 4:
     col_edit, col_preview = st.columns([1, 1])
     
     with col_edit:
-        st.subheader("📝 Edit")
-        
-        # Profile
-        profile = st.session_state.preview_resume.get('profile', '')
-        if profile:
-            with st.expander("📄 Summary", expanded=True):
-                new_profile = st.text_area("Profile", value=profile, height=150, key="live_profile", label_visibility="collapsed")
-                st.session_state.preview_resume['profile'] = new_profile
-        
-        # Skills
-        skills_dict = st.session_state.preview_resume.get('skills', {})
-        if skills_dict:
-            with st.expander("🛠️ Skills", expanded=True):
-                for category_name, skills_list in skills_dict.items():
-                    display_name = category_name.replace('_', ' ').title()
-                    skills_str = ', '.join(skills_list) if isinstance(skills_list, list) else str(skills_list)
-                    
-                    edited_skills = st.text_area(
-                        display_name,
-                        value=skills_str,
-                        height=80,
-                        key=f"live_skills_{category_name}",
-                        label_visibility="visible"
-                    )
-                    
-                    st.session_state.preview_resume['skills'][category_name] = [
-                        s.strip() for s in edited_skills.split(',') if s.strip()
-                    ]
-        
-        # Experience
-        experiences = st.session_state.preview_resume.get('experience', [])
-        if experiences:
-            with st.expander("💼 Experience", expanded=True):
-                for exp_idx, exp in enumerate(experiences):
-                    title = exp.get('title', 'Position')
-                    company = exp.get('company', 'Company')
-                    
-                    st.markdown(f"**{title}** at {company}")
-                    
-                    achievements = exp.get('achievements', [])
-                    for ach_idx, ach in enumerate(achievements):
-                        col_ach, col_del = st.columns([0.9, 0.1])
-                        
-                        with col_ach:
-                            if isinstance(ach, dict):
-                                desc = ach.get('description', '')
-                            else:
-                                desc = str(ach)
-                            
-                            new_desc = st.text_area(
-                                f"Achievement {ach_idx + 1}",
-                                value=desc,
-                                height=80,
-                                key=f"live_ach_{exp_idx}_{ach_idx}",
-                                label_visibility="collapsed"
-                            )
-                            
-                            if isinstance(ach, dict):
-                                exp['achievements'][ach_idx]['description'] = new_desc
-                            else:
-                                exp['achievements'][ach_idx] = new_desc
-                        
-                        with col_del:
-                            if st.button("🗑️", key=f"del_{exp_idx}_{ach_idx}"):
-                                exp['achievements'].pop(ach_idx)
-                                st.rerun()
-                    
-                    # ADD button
-                    if st.button(f"➕ Add Achievement to {company}", key=f"add_ach_{exp_idx}", use_container_width=True):
-                        exp['achievements'].append({
-                            "category": "",
-                            "description": "New achievement - edit this text"
-                        })
-                        st.rerun()
-                    
-                    if exp_idx < len(experiences) - 1:
-                        st.markdown("---")
+        edit_panel()
     
     with col_preview:
-        st.subheader("👁️ Preview")
-        
-        with st.spinner("Rendering..."):
-            pdf_base64 = generate_pdf_preview(st.session_state.preview_resume)
-        
-        if pdf_base64:
-            st.markdown(f'<iframe src="data:application/pdf;base64,{pdf_base64}" width="100%" height="900px" style="border:1px solid #ddd;"></iframe>', unsafe_allow_html=True)
-        else:
-            st.error("❌ Failed to generate PDF preview")
-        
-        if st.button("🔄 Refresh", use_container_width=True):
-            st.rerun()
+        preview_panel()
     
     st.markdown("---")
     
@@ -503,27 +717,31 @@ elif st.session_state.step == 5:
     st.markdown("---")
     
     # Generate final PDF
-    if 'final_pdf_path' not in st.session_state:
+    if 'final_pdf_bytes' not in st.session_state:
         with st.spinner("📄 Generating final PDF..."):
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 company_slug = st.session_state.jd_requirements.get('company_name', 'resume').replace(' ', '_').lower()
                 output_filename = f"resume_tailored_{company_slug}_{timestamp}.json"
                 output_path = settings.OUTPUT_DIR / output_filename
-                
-                # Save tailored resume JSON
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(st.session_state.preview_resume, f, indent=2, ensure_ascii=False)
-                
-                # Generate PDF
                 pdf_filename = f"resume_{company_slug}_{timestamp}.pdf"
                 pdf_path = settings.OUTPUT_DIR / pdf_filename
                 
-                builder = ResumeBuilder(str(output_path))
-                builder.generate_pdf(str(pdf_path))
+                resume_data = st.session_state.preview_resume
                 
+                json_bytes = dumps_json(resume_data, indent=True)
+                
+                # Reuses the last preview render if the resume is unchanged
+                _, pdf_bytes = render_pdf(resume_data)
+                
+                output_path.write_bytes(json_bytes)
+                pdf_path.write_bytes(pdf_bytes)
+                
+                # Downloads are served from memory - the files are the saved copies
                 st.session_state.final_pdf_path = pdf_path
                 st.session_state.final_json_path = output_path
+                st.session_state.final_pdf_bytes = pdf_bytes
+                st.session_state.final_json_bytes = json_bytes
                 
             except Exception as e:
                 st.error(f"❌ Failed to generate PDF: {str(e)}")
@@ -534,32 +752,24 @@ elif st.session_state.step == 5:
     
     with col1:
         st.subheader("📄 Resume PDF")
-        if st.session_state.final_pdf_path.exists():
-            with open(st.session_state.final_pdf_path, 'rb') as f:
-                pdf_bytes = f.read()
-            
-            st.download_button(
-                label="⬇️ Download PDF",
-                data=pdf_bytes,
-                file_name=st.session_state.final_pdf_path.name,
-                mime="application/pdf",
-                use_container_width=True,
-                type="primary"
-            )
+        st.download_button(
+            label="⬇️ Download PDF",
+            data=st.session_state.final_pdf_bytes,
+            file_name=st.session_state.final_pdf_path.name,
+            mime="application/pdf",
+            use_container_width=True,
+            type="primary"
+        )
     
     with col2:
         st.subheader("📊 Resume JSON")
-        if st.session_state.final_json_path.exists():
-            with open(st.session_state.final_json_path, 'r', encoding='utf-8') as f:
-                json_data = f.read()
-            
-            st.download_button(
-                label="⬇️ Download JSON",
-                data=json_data,
-                file_name=st.session_state.final_json_path.name,
-                mime="application/json",
-                use_container_width=True
-            )
+        st.download_button(
+            label="⬇️ Download JSON",
+            data=st.session_state.final_json_bytes,
+            file_name=st.session_state.final_json_path.name,
+            mime="application/json",
+            use_container_width=True
+        )
     
     st.markdown("---")
     
@@ -596,8 +806,7 @@ elif st.session_state.step == 5:
             }
             
             report_path = settings.OUTPUT_DIR / f"optimization_report_{company_slug}_{timestamp}.json"
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2)
+            save_json(report, report_path)
             
             st.success(f"✅ Report saved to `{settings.OUTPUT_DIR}`")
     